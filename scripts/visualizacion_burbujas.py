@@ -5,25 +5,42 @@ Proyecto: Comparación entre la burbuja puntocom y la narrativa de burbuja de la
 Autor: Álvaro García
 
 Requisitos:
-    pip install pandas plotly openpyxl
+    pip install pandas pyarrow plotly openpyxl tsdownsample orjson
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.io as pio
+from tsdownsample import MinMaxLTTBDownsampler
+
+# Plantilla común para todas las figuras
+pio.templates.default = "plotly_white"
+
+# Serialización JSON de las figuras con orjson
+pio.json.config.default_engine = "orjson"
 
 # ---------------------------------------------------------------------
 # 1. Carga de datos
 # ---------------------------------------------------------------------
 
 # Dataset procesado generado desde R
+# Leemos con el motor de pyarrow y solo las columnas que se usan en los gráficos
 df = pd.read_csv(
     "data_processed/indices_dotcom_ia_dataset.csv",
+    engine="pyarrow",
+    usecols=["date", "index", "period", "close", "drawdown", "rolling_vol_30d"],
     parse_dates=["date"]
 )
 
+# Índice y periodo como categorías: comparaciones y agrupaciones sobre códigos enteros
+df["index"] = df["index"].astype("category")
+df["period"] = df["period"].astype("category")
+
 # Tabla de eventos (Excel) con columnas: date, event_name, description
 events = pd.read_excel(
     "eventos_dotcom_ia.xlsx",
@@ -35,8 +52,11 @@ events["date"] = pd.to_datetime(events["date"])
 # 2. Preparación de datos para las visualizaciones
 # ---------------------------------------------------------------------
 
-# Ordenamos por índice, periodo y fecha
-df = df.sort_values(["index", "period", "date"])
+# El CSV generado desde R ya viene ordenado por fecha dentro de cada índice y periodo,
+# así que solo lo comprobamos en lugar de reordenar todo el dataset
+assert df.groupby(["index", "period"], sort=False, observed=True)["date"].is_monotonic_increasing.all(), (
+    "El dataset debe estar ordenado por fecha dentro de cada índice y periodo"
+)
 
 # Etiquetas legibles para los periodos
 period_labels = {
@@ -46,74 +66,76 @@ period_labels = {
 df["period_label"] = df["period"].map(period_labels)
 
 # 2.1. Precio normalizado (base 100 al inicio de cada índice y periodo)
-df["close_indexed_100"] = (
+# Usamos transform("first") (ruta vectorizada) en lugar de una lambda por grupo
+base_close = (
     df
-    .groupby(["index", "period"])["close"]
-    .transform(lambda s: s / s.iloc[0] * 100)
+    .groupby(["index", "period"], sort=False, observed=True)["close"]
+    .transform("first")
 )
+df["close_indexed_100"] = df["close"].to_numpy() / base_close.to_numpy() * 100.0
 
 # 2.2. Drawdown en porcentaje
 df["drawdown_pct"] = df["drawdown"] * 100
 
 # 2.3. Filtramos filas válidas para volatilidad rolling
-df_vol = df[df["rolling_vol_30d"].notna()].copy()
+# Solo las columnas necesarias y sin copia profunda: df_vol únicamente se lee
+df_vol = df.loc[df["rolling_vol_30d"].notna(), ["date", "index", "period", "rolling_vol_30d"]]
 
 # 2.4. Preparamos datos de eventos alineados con el Nasdaq
 # Usamos solo el Nasdaq como índice principal para anotar eventos
 nasdaq = df[df["index"] == "NASDAQ"].sort_values("date")
 
-# Inferimos el periodo del evento por su fecha
-def infer_period(date):
-    if pd.Timestamp("1997-01-01") <= date <= pd.Timestamp("2002-12-31"):
-        return "dotcom"
-    elif pd.Timestamp("2020-01-01") <= date <= pd.Timestamp("2025-12-31"):
-        return "ia"
-    else:
-        return None
-
-events["period"] = events["date"].apply(infer_period)
+# Inferimos el periodo del evento por su fecha (máscaras vectorizadas)
+is_dotcom = events["date"].between(pd.Timestamp("1997-01-01"), pd.Timestamp("2002-12-31"))
+is_ia = events["date"].between(pd.Timestamp("2020-01-01"), pd.Timestamp("2025-12-31"))
+events["period"] = pd.Categorical(
+    np.select([is_dotcom, is_ia], ["dotcom", "ia"], default=None),
+    categories=["dotcom", "ia"]
+)
 events = events[events["period"].notna()].copy()
 events["period_label"] = events["period"].map(period_labels)
 
 # Alineamos cada evento con el último día de cotización disponible del Nasdaq
-events_aligned = pd.merge_asof(
-    events.sort_values("date"),
-    nasdaq[["date", "close", "period", "period_label"]].sort_values("date"),
-    on="date",
-    direction="backward",
-    suffixes=("_event", "_idx")
+# (equivale a un merge_asof hacia atrás; nasdaq ya está ordenado por fecha)
+events = events.sort_values("date")
+pos = nasdaq["date"].searchsorted(events["date"], side="right") - 1
+valid = pos >= 0
+nasdaq_match = nasdaq[["close", "period", "period_label"]].iloc[pos[valid]].reset_index(drop=True)
+events_aligned = events[valid].reset_index(drop=True).join(
+    nasdaq_match,
+    lsuffix="_event",
+    rsuffix="_idx"
 )
 
 # Unificamos las columnas de periodo y etiqueta de periodo
-events_aligned["period_final"] = events_aligned["period_event"].where(
-    events_aligned["period_event"].notna(),
-    events_aligned["period_idx"]
-)
-events_aligned["period_label_final"] = events_aligned["period_label_event"].where(
-    events_aligned["period_label_event"].notna(),
+events_aligned["period"] = events_aligned["period_event"].combine_first(events_aligned["period_idx"])
+events_aligned["period_label"] = events_aligned["period_label_event"].combine_first(
     events_aligned["period_label_idx"]
 )
 
-events_aligned = events_aligned.rename(
-    columns={
-        "period_final": "period",
-        "period_label_final": "period_label"
-    }
-)
-
 # Nos quedamos solo con las columnas que vamos a usar
 events_aligned = events_aligned[["date", "event_name", "description", "close", "period", "period_label"]]
 
+# 2.5. Reducción de puntos para las series diarias
+# MinMaxLTTB conserva la forma visual de la serie con muchos menos puntos,
+# lo que aligera el HTML final y el renderizado en el navegador
+N_POINTS_PLOT = 1000
+
+# Devolvemos arrays de NumPy para que Plotly no tenga que convertir Series de pandas
+def downsample_series(sub, col, n_out=N_POINTS_PLOT):
+    dates = sub["date"].to_numpy()
+    y = sub[col].to_numpy(dtype=np.float64)
+    x = dates.astype("datetime64[ns]").view("int64")
+    idx = MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out)
+    return dates[idx], y[idx]
+
 
 # ---------------------------------------------------------------------
 # 3. Gráfico 1: Evolución normalizada de Nasdaq y S&P 500
 # ---------------------------------------------------------------------
 
-from plotly.subplots import make_subplots
-import plotly.graph_objects as go
-
-df_dotcom = df[df["period"] == "dotcom"].copy()
-df_ia = df[df["period"] == "ia"].copy()
+# Agrupamos una sola vez por periodo e índice para acceder a cada serie directamente
+groups = {key: sub for key, sub in df.groupby(["period", "index"], sort=False, observed=True)}
 
 fig1 = make_subplots(
     rows=1,
@@ -132,11 +154,12 @@ colors = {
 
 # Panel izquierdo: puntocom
 for idx_name in ["NASDAQ", "SP500"]:
-    sub = df_dotcom[df_dotcom["index"] == idx_name]
+    sub = groups[("dotcom", idx_name)]
+    x, y = downsample_series(sub, "close_indexed_100")
     fig1.add_trace(
-        go.Scatter(
-            x=sub["date"],
-            y=sub["close_indexed_100"],
+        go.Scattergl(
+            x=x,
+            y=y,
             mode="lines",
             name=idx_name,
             line=dict(color=colors[idx_name]),
@@ -148,11 +171,12 @@ for idx_name in ["NASDAQ", "SP500"]:
 
 # Panel derecho: IA
 for idx_name in ["NASDAQ", "SP500"]:
-    sub = df_ia[df_ia["index"] == idx_name]
+    sub = groups[("ia", idx_name)]
+    x, y = downsample_series(sub, "close_indexed_100")
     fig1.add_trace(
-        go.Scatter(
-            x=sub["date"],
-            y=sub["close_indexed_100"],
+        go.Scattergl(
+            x=x,
+            y=y,
             mode="lines",
             name=idx_name,
             line=dict(color=colors[idx_name]),
@@ -162,24 +186,14 @@ for idx_name in ["NASDAQ", "SP500"]:
         col=2
     )
 
+# Misma configuración de eje temporal en ambos paneles
 fig1.update_xaxes(
     title_text="Fecha",
-    row=1,
-    col=1,
     dtick="M12",          # tick cada 12 meses
     tickformat="%Y"       # mostrar solo el año
 )
 
-fig1.update_xaxes(
-    title_text="Fecha",
-    row=1,
-    col=2,
-    dtick="M12",
-    tickformat="%Y"
-)
-
 fig1.update_layout(
-    template="plotly_white",
     title="Evolución normalizada de Nasdaq y S&P 500 en las dos épocas",
     legend_title_text="Índice",
     height=500,
@@ -205,11 +219,12 @@ min_dd = df["drawdown_pct"].min()
 
 # Panel izquierdo: puntocom
 for idx_name in ["NASDAQ", "SP500"]:
-    sub = df_dotcom[df_dotcom["index"] == idx_name]
+    sub = groups[("dotcom", idx_name)]
+    x, y = downsample_series(sub, "drawdown_pct")
     fig2.add_trace(
-        go.Scatter(
-            x=sub["date"],
-            y=sub["drawdown_pct"],
+        go.Scattergl(
+            x=x,
+            y=y,
             mode="lines",
             name=idx_name,
             line=dict(color=colors[idx_name]),
@@ -221,11 +236,12 @@ for idx_name in ["NASDAQ", "SP500"]:
 
 # Panel derecho: IA
 for idx_name in ["NASDAQ", "SP500"]:
-    sub = df_ia[df_ia["index"] == idx_name]
+    sub = groups[("ia", idx_name)]
+    x, y = downsample_series(sub, "drawdown_pct")
     fig2.add_trace(
-        go.Scatter(
-            x=sub["date"],
-            y=sub["drawdown_pct"],
+        go.Scattergl(
+            x=x,
+            y=y,
             mode="lines",
             name=idx_name,
             line=dict(color=colors[idx_name]),
@@ -235,41 +251,16 @@ for idx_name in ["NASDAQ", "SP500"]:
         col=2
     )
 
-fig2.update_xaxes(
-    title_text="Fecha",
-    row=1,
-    col=1,
-    dtick="M12",
-    tickformat="%Y"
-)
-
-fig2.update_xaxes(
-    title_text="Fecha",
-    row=1,
-    col=2,
-    dtick="M12",
-    tickformat="%Y"
-)
-
-fig2.update_yaxes(
-    title_text="Drawdown (%)",
-    row=1,
-    col=1,
-    ticksuffix=" %",
-    range=[-100, 10]   # rango más amplio para tener espacio arriba
-)
+fig2.update_xaxes(title_text="Fecha", dtick="M12", tickformat="%Y")
 
 fig2.update_yaxes(
     title_text="Drawdown (%)",
-    row=1,
-    col=2,
     ticksuffix=" %",
-    range=[-100, 10]   # misma ampliación
+    range=[-100, 10]   # rango más amplio para tener espacio arriba (ambos paneles)
 )
 
 
 fig2.update_layout(
-    template="plotly_white",
     title="Profundidad de las caídas (drawdown) en cada burbuja",
     legend_title_text="Índice",
     height=500,
@@ -280,8 +271,7 @@ fig2.update_layout(
 # 5. Gráfico 3: Volatilidad rolling a 30 días
 # ---------------------------------------------------------------------
 
-df_vol_dotcom = df_vol[df_vol["period"] == "dotcom"].copy()
-df_vol_ia = df_vol[df_vol["period"] == "ia"].copy()
+groups_vol = {key: sub for key, sub in df_vol.groupby(["period", "index"], sort=False, observed=True)}
 
 fig3 = make_subplots(
     rows=1,
@@ -295,11 +285,12 @@ fig3 = make_subplots(
 
 # Panel izquierdo: puntocom
 for idx_name in ["NASDAQ", "SP500"]:
-    sub = df_vol_dotcom[df_vol_dotcom["index"] == idx_name]
+    sub = groups_vol[("dotcom", idx_name)]
+    x, y = downsample_series(sub, "rolling_vol_30d")
     fig3.add_trace(
-        go.Scatter(
-            x=sub["date"],
-            y=sub["rolling_vol_30d"],
+        go.Scattergl(
+            x=x,
+            y=y,
             mode="lines",
             name=idx_name,
             line=dict(color=colors[idx_name]),
@@ -311,11 +302,12 @@ for idx_name in ["NASDAQ", "SP500"]:
 
 # Panel derecho: IA
 for idx_name in ["NASDAQ", "SP500"]:
-    sub = df_vol_ia[df_vol_ia["index"] == idx_name]
+    sub = groups_vol[("ia", idx_name)]
+    x, y = downsample_series(sub, "rolling_vol_30d")
     fig3.add_trace(
-        go.Scatter(
-            x=sub["date"],
-            y=sub["rolling_vol_30d"],
+        go.Scattergl(
+            x=x,
+            y=y,
             mode="lines",
             name=idx_name,
             line=dict(color=colors[idx_name]),
@@ -325,26 +317,11 @@ for idx_name in ["NASDAQ", "SP500"]:
         col=2
     )
 
-fig3.update_xaxes(
-    title_text="Fecha",
-    row=1,
-    col=1,
-    dtick="M12",
-    tickformat="%Y"
-)
-
-fig3.update_xaxes(
-    title_text="Fecha",
-    row=1,
-    col=2,
-    dtick="M12",
-    tickformat="%Y"
-)
+fig3.update_xaxes(title_text="Fecha", dtick="M12", tickformat="%Y")
 
 fig3.update_yaxes(title_text="Volatilidad rolling 30 días", row=1, col=1)
 
 fig3.update_layout(
-    template="plotly_white",
     title="Volatilidad rolling a 30 días en las dos épocas",
     legend_title_text="Índice",
     height=500,
@@ -367,14 +344,19 @@ fig4 = make_subplots(
     ]
 )
 
+# Eventos agrupados por periodo (vacío si un periodo no tiene eventos)
+events_by_period = dict(tuple(events_aligned.groupby("period", sort=False, observed=True)))
+no_events = events_aligned.iloc[:0]
+
 # Dotcom
-nasdaq_dotcom = nasdaq[nasdaq["period"] == "dotcom"]
-events_dotcom = events_aligned[events_aligned["period"] == "dotcom"]
+nasdaq_dotcom = groups[("dotcom", "NASDAQ")]
+events_dotcom = events_by_period.get("dotcom", no_events)
 
+x, y = downsample_series(nasdaq_dotcom, "close")
 fig4.add_trace(
-    go.Scatter(
-        x=nasdaq_dotcom["date"],
-        y=nasdaq_dotcom["close"],
+    go.Scattergl(
+        x=x,
+        y=y,
         mode="lines",
         name="Nasdaq (dotcom)",
         line=dict(color="#1f77b4")
@@ -385,13 +367,13 @@ fig4.add_trace(
 
 if not events_dotcom.empty:
     fig4.add_trace(
-        go.Scatter(
-            x=events_dotcom["date"],
-            y=events_dotcom["close"],
+        go.Scattergl(
+            x=events_dotcom["date"].to_numpy(),
+            y=events_dotcom["close"].to_numpy(),
             mode="markers",
             name="Eventos dotcom",
             marker=dict(size=9, color="#d62728", symbol="circle"),
-            text=events_dotcom["event_name"],
+            text=events_dotcom["event_name"].to_numpy(),
             hovertemplate="<b>%{text}</b><br>Fecha: %{x|%Y-%m-%d}<br>Cierre Nasdaq: %{y:.2f}<extra></extra>"
         ),
         row=1,
@@ -399,13 +381,14 @@ if not events_dotcom.empty:
     )
 
 # IA
-nasdaq_ia = nasdaq[nasdaq["period"] == "ia"]
-events_ia = events_aligned[events_aligned["period"] == "ia"]
+nasdaq_ia = groups[("ia", "NASDAQ")]
+events_ia = events_by_period.get("ia", no_events)
 
+x, y = downsample_series(nasdaq_ia, "close")
 fig4.add_trace(
-    go.Scatter(
-        x=nasdaq_ia["date"],
-        y=nasdaq_ia["close"],
+    go.Scattergl(
+        x=x,
+        y=y,
         mode="lines",
         name="Nasdaq (IA)",
         line=dict(color="#2ca02c")
@@ -416,13 +399,13 @@ fig4.add_trace(
 
 if not events_ia.empty:
     fig4.add_trace(
-        go.Scatter(
-            x=events_ia["date"],
-            y=events_ia["close"],
+        go.Scattergl(
+            x=events_ia["date"].to_numpy(),
+            y=events_ia["close"].to_numpy(),
             mode="markers",
             name="Eventos IA",
             marker=dict(size=9, color="#ff7f0e", symbol="diamond"),
-            text=events_ia["event_name"],
+            text=events_ia["event_name"].to_numpy(),
             hovertemplate="<b>%{text}</b><br>Fecha: %{x|%Y-%m-%d}<br>Cierre Nasdaq: %{y:.2f}<extra></extra>"
         ),
         row=2,
@@ -435,7 +418,6 @@ fig4.update_yaxes(title_text="Cierre Nasdaq", row=1, col=1)
 fig4.update_yaxes(title_text="Cierre Nasdaq", row=2, col=1)
 
 fig4.update_layout(
-    template="plotly_white",
     height=700,
     margin=dict(l=60, r=20, t=80, b=40),
     legend_title_text="Serie"
@@ -445,12 +427,28 @@ fig4.update_layout(
 # 7. Exportar a HTML con narrativa en capítulos
 # ---------------------------------------------------------------------
 
-fig1_html = pio.to_html(fig1, include_plotlyjs=False, full_html=False)
-fig2_html = pio.to_html(fig2, include_plotlyjs=False, full_html=False)
-fig3_html = pio.to_html(fig3, include_plotlyjs=False, full_html=False)
-fig4_html = pio.to_html(fig4, include_plotlyjs=False, full_html=False)
+# Fragmentos mínimos: sin plotly.js ni MathJax (plotly.js se carga una vez en <head>)
+def fig_to_html(fig, div_id):
+    return pio.to_html(
+        fig,
+        include_plotlyjs=False,
+        include_mathjax=False,
+        full_html=False,
+        validate=False,
+        div_id=div_id,
+        config={"responsive": True, "displaylogo": False}
+    )
+
+# Serializamos las cuatro figuras en paralelo
+with ThreadPoolExecutor(max_workers=4) as executor:
+    fig1_html, fig2_html, fig3_html, fig4_html = executor.map(
+        fig_to_html,
+        [fig1, fig2, fig3, fig4],
+        ["fig1", "fig2", "fig3", "fig4"]
+    )
 
-html_template = f"""
+# Cabecera (estilos incluidos) y pie del documento
+html_header = """
 <!DOCTYPE html>
 <html lang="es">
 <head>
@@ -459,66 +457,66 @@ html_template = f"""
     <meta name="viewport" content="width=device-width, initial-scale=1" />
     <script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
     <style>
-        body {{
+        body {
             margin: 0;
             font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
             background: #f5f5f7;
             color: #222;
-        }}
-        header {{
+        }
+        header {
             background: #111827;
             color: #f9fafb;
             padding: 1.5rem 0;
-        }}
-        header .wrapper {{
+        }
+        header .wrapper {
             max-width: 1100px;
             margin: 0 auto;
             padding: 0 1.5rem;
-        }}
-        header h1 {{
+        }
+        header h1 {
             margin: 0;
             font-size: 1.6rem;
-        }}
-        header p {{
+        }
+        header p {
             margin: 0.25rem 0 0;
             font-size: 0.95rem;
             opacity: 0.85;
-        }}
-        main {{
+        }
+        main {
             max-width: 1100px;
             margin: 1.5rem auto 2rem;
             padding: 0 1.5rem;
-        }}
-        section {{
+        }
+        section {
             background: #ffffff;
             border-radius: 0.75rem;
             padding: 1.25rem 1.5rem;
             margin-bottom: 1.5rem;
             box-shadow: 0 10px 25px rgba(15, 23, 42, 0.06);
-        }}
-        h2 {{
+        }
+        h2 {
             margin-top: 0;
             font-size: 1.3rem;
-        }}
-        p.lead {{
+        }
+        p.lead {
             font-size: 0.98rem;
             line-height: 1.5;
             margin-bottom: 0.75rem;
-        }}
-        .plot-container {{
+        }
+        .plot-container {
             margin-top: 0.75rem;
-        }}
-        footer {{
+        }
+        footer {
             text-align: center;
             font-size: 0.8rem;
             padding: 1rem 0 1.5rem;
             color: #6b7280;
-        }}
-        @media (max-width: 768px) {{
-            section {{
+        }
+        @media (max-width: 768px) {
+            section {
                 padding: 1rem 1rem;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -529,68 +527,83 @@ html_template = f"""
         </div>
     </header>
     <main>
-        <section id="capitulo1">
-            <h2>1. Dos épocas, dos narrativas de mercado</h2>
-            <p class="lead">
-                Este primer gráfico muestra la evolución normalizada del Nasdaq y del S&amp;P 500 en cada una de las dos épocas.
-                El panel de la izquierda recoge la burbuja puntocom (1997–2002) y el de la derecha la narrativa reciente de la IA (2020–2025).
-                Al fijar una base 100 en el inicio de cada periodo y compartir la escala vertical, podemos comparar de forma directa
-                la intensidad relativa de las subidas y de las correcciones entre ambas burbujas.
-            </p>
-            <div class="plot-container">
-                {fig1_html}
-            </div>
-        </section>
+"""
 
-        <section id="capitulo2">
-            <h2>2. La profundidad de las caídas: drawdown</h2>
-            <p class="lead">
-                El segundo gráfico se centra en el drawdown, es decir, en la caída porcentual desde el máximo histórico hasta cada día.
-                De nuevo, el panel izquierdo muestra la fase puntocom y el derecho la época de la IA, compartiendo la misma escala vertical.
-                Esto permite visualizar de un vistazo la severidad de las correcciones en cada burbuja y comparar el comportamiento
-                de ambos índices en las fases de ajuste.
-            </p>
-            <div class="plot-container">
-                {fig2_html}
-            </div>
-        </section>
+html_footer = """    </main>
+    <footer>
+        Proyecto de visualización – Máster de Ciencia de Datos (UOC)
+    </footer>
+</body>
+</html>
+"""
 
-        <section id="capitulo3">
-            <h2>3. Volatilidad como síntoma de tensión</h2>
+# Cada capítulo se genera y escribe por separado, sin construir el documento completo en memoria
+def html_section(section_id, title, lead, fig_html):
+    return f"""        <section id="{section_id}">
+            <h2>{title}</h2>
             <p class="lead">
-                El tercer gráfico representa la volatilidad calculada como la desviación estándar de los retornos diarios en una ventana
-                móvil de 30 días. El panel izquierdo corresponde a la burbuja puntocom y el derecho a la narrativa de la IA. De este modo
-                se puede observar cómo la volatilidad se incrementa en los momentos de mayor tensión del mercado y hasta qué punto
-                los patrones difieren entre las dos épocas.
+                {lead}
             </p>
             <div class="plot-container">
-                {fig3_html}
+                {fig_html}
             </div>
         </section>
 
-        <section id="capitulo4">
-            <h2>4. Eventos clave en el Nasdaq</h2>
-            <p class="lead">
-                Por último, este gráfico sitúa algunos eventos significativos sobre la trayectoria del Nasdaq en cada época,
-                desde fusiones emblemáticas y quiebras corporativas en la burbuja puntocom hasta hitos recientes como el lanzamiento de ChatGPT,
-                las inversiones en modelos fundacionales o la revalorización de Nvidia.
-                Las anotaciones permiten conectar la narrativa cualitativa con el comportamiento cuantitativo del índice.
-            </p>
-            <div class="plot-container">
-                {fig4_html}
-            </div>
-        </section>
-    </main>
-    <footer>
-        Proyecto de visualización – Máster de Ciencia de Datos (UOC)
-    </footer>
-</body>
-</html>
 """
 
+sections = [
+    (
+        "capitulo1",
+        "1. Dos épocas, dos narrativas de mercado",
+        (
+            "Este primer gráfico muestra la evolución normalizada del Nasdaq y del S&amp;P 500 en cada una de las dos épocas. "
+            "El panel de la izquierda recoge la burbuja puntocom (1997–2002) y el de la derecha la narrativa reciente de la IA (2020–2025). "
+            "Al fijar una base 100 en el inicio de cada periodo y compartir la escala vertical, podemos comparar de forma directa "
+            "la intensidad relativa de las subidas y de las correcciones entre ambas burbujas."
+        ),
+        fig1_html
+    ),
+    (
+        "capitulo2",
+        "2. La profundidad de las caídas: drawdown",
+        (
+            "El segundo gráfico se centra en el drawdown, es decir, en la caída porcentual desde el máximo histórico hasta cada día. "
+            "De nuevo, el panel izquierdo muestra la fase puntocom y el derecho la época de la IA, compartiendo la misma escala vertical. "
+            "Esto permite visualizar de un vistazo la severidad de las correcciones en cada burbuja y comparar el comportamiento "
+            "de ambos índices en las fases de ajuste."
+        ),
+        fig2_html
+    ),
+    (
+        "capitulo3",
+        "3. Volatilidad como síntoma de tensión",
+        (
+            "El tercer gráfico representa la volatilidad calculada como la desviación estándar de los retornos diarios en una ventana "
+            "móvil de 30 días. El panel izquierdo corresponde a la burbuja puntocom y el derecho a la narrativa de la IA. De este modo "
+            "se puede observar cómo la volatilidad se incrementa en los momentos de mayor tensión del mercado y hasta qué punto "
+            "los patrones difieren entre las dos épocas."
+        ),
+        fig3_html
+    ),
+    (
+        "capitulo4",
+        "4. Eventos clave en el Nasdaq",
+        (
+            "Por último, este gráfico sitúa algunos eventos significativos sobre la trayectoria del Nasdaq en cada época, "
+            "desde fusiones emblemáticas y quiebras corporativas en la burbuja puntocom hasta hitos recientes como el lanzamiento de ChatGPT, "
+            "las inversiones en modelos fundacionales o la revalorización de Nvidia. "
+            "Las anotaciones permiten conectar la narrativa cualitativa con el comportamiento cuantitativo del índice."
+        ),
+        fig4_html
+    )
+]
+
 # Guardamos el HTML final
 with open("index.html", "w", encoding="utf-8") as f:
-    f.write(html_template)
+    f.write(html_header)
+    for section_id, title, lead, fig_html in sections:
+        f.write(html_section(section_id, title, lead, fig_html))
+    f.write(html_footer)
 
 print("Visualización generada en 'index.html'")
 